@@ -2,8 +2,49 @@ import cv2
 import mediapipe as mp
 import numpy as np
 import logging
+import math
+import os
 import time
 
+from gesture_kernels import NUM_LANDMARKS, analyze
+
+# Most hands tracked per frame; also sizes the per-hand landmark buffers
+MAX_NUM_HANDS = 2
+
+# Fixed gesture thresholds, kept at module level so the per-frame checks read
+# globals instead of instance attributes (coordinates are normalized to 0-1)
+PLAY_PAUSE_COOLDOWN = 2.0    # Seconds; longer cooldown for play/pause
+GESTURE_COOLDOWN = 0.3       # Seconds; reduced from 0.5 to make gestures more responsive
+SWIPE_NET_DIST = 0.08        # Net travel for a swipe/volume gesture at the default cadence
+MIN_SWIPE_NET_DIST = 0.05    # Floor for the scaled travel; landmark jitter doesn't shrink with the cadence
+SWIPE_RATIO = 0.5            # Swipe when vertical travel < SWIPE_RATIO * horizontal
+VOLUME_RATIO = 1.5           # Volume when vertical travel > VOLUME_RATIO * horizontal
+OPEN_PALM_THRESH = 0.12      # Bigger means requiring a wider hand spread
+CLOSED_FIST_THRESH = 0.06    # Smaller means requiring a tighter fist
+QUIT_WRIST_Y = 0.3           # Both wrists above this line means "quit"
+MIN_SWIPE_FRAMES = 3         # Increased from 2 to ensure intentional swipes
+MOVEMENT_HISTORY_SIZE = 3    # Track fewer frames
+DEFAULT_EVERY_N_FRAMES = 4   # Frame-skip cadence the thresholds were tuned at
+MAX_EVERY_N_FRAMES = 8
+MAX_REUSED_RESULTS = 5       # Force an inference after this many gated frames in a row
+ERROR_LOG_INTERVAL = 1.0     # Seconds between repeated hands.process error logs
+
+
+def _env_flag(name, default):
+    """
+    Read an on/off environment variable: 1/true or 0/false, case-insensitive.
+    Unset or empty gives default.
+    """
+    value = os.environ.get(name, "").strip().lower()
+    if not value:
+        return default
+    if value in ("1", "true"):
+        return True
+    if value in ("0", "false"):
+        return False
+    raise ValueError(f"{name} must be 0, 1, true or false, got {os.environ[name]!r}")
+
+
 class GestureDetector:
     def __init__(self):
         # Initialize logger
@@ -12,235 +53,323 @@ class GestureDetector:
         
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
-        self.hands = self.mp_hands.Hands(
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        )
+        # Draw landmarks only when the preview is shown (DJARVIS_SHOW=0 for headless)
+        self.debug_draw = _env_flag("DJARVIS_SHOW", True)
+        model_path = os.environ.get("DJARVIS_HAND_MODEL")
+        if model_path:
+            # Tasks HandLandmarker with a hand_landmarker.task bundle, on the GPU if available
+            from hand_landmarker import TaskHandLandmarker
+            self.hands = TaskHandLandmarker(
+                model_path,
+                use_gpu=_env_flag("DJARVIS_GPU", True),
+                max_num_hands=MAX_NUM_HANDS,
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.5
+            )
+        else:
+            # Video mode keeps tracking hands across frames so the palm detector only
+            # reruns when tracking is lost; model_complexity=0 selects the lite model
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                model_complexity=0,
+                max_num_hands=MAX_NUM_HANDS,
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.5  # Lower so tracking holds and re-detection fires less
+            )
         # Add debounce settings
         self.last_gesture_time = 0
-        self.play_pause_cooldown = 2.0  # Longer cooldown for play/pause
-        self.gesture_cooldown = 0.3  # Reduced from 0.5 to make gestures more responsive
         self.last_gesture = None
         
         # Store initial position for swipe detection
         self.initial_position = None
-        # Track movement history
-        self.movement_history = []
-        # Add swipe thresholds
-        self.swipe_threshold = 0.05  # Reduced from 0.1 to make swipes even easier to detect
-        self.min_swipe_frames = 3    # Increased from 2 to ensure intentional swipes
-        self.movement_history_size = 3  # New parameter to track fewer frames
+        self.swipe_distance = SWIPE_NET_DIST  # Scaled with the current cadence
+        # Track movement history in a preallocated ring buffer of (x, y) offsets
+        self._hist_xy = np.zeros((MOVEMENT_HISTORY_SIZE, 2), dtype=np.float32)
+        self._hist_head = 0   # Next slot to write
+        self._hist_count = 0  # Number of valid samples
+        # Per-hand (x, y) landmarks, copied out of the protobuf results once per inference;
+        # _hands_flat holds contiguous 1-D views of the same rows for the compiled kernel
+        self._hands_xy = np.zeros((MAX_NUM_HANDS, NUM_LANDMARKS, 2), dtype=np.float32)
+        self._hands_flat = [hand_xy.reshape(-1) for hand_xy in self._hands_xy]
+        self._num_hands = 0
         self.frame_skip_count = 0  # Add a counter for skipping frames
-        self.process_every_n_frames = 4  # e.g. only process every 4th frame
+        self.process_every_n_frames = DEFAULT_EVERY_N_FRAMES  # e.g. only process every 4th frame
+        # Adaptive frame skipping: pick the cadence from measured processing cost
+        self.target_frame_ms = 30.0  # Processing budget per captured frame
+        self.adapt_interval = 1.0    # Seconds between cadence updates
+        self._avg_process_ms = None  # EWMA of process_frame time on processed frames
+        self._last_adapt_time = time.time()
+        # Motion gate: reuse the last MediaPipe results when the scene barely changed
+        self.motion_threshold = 2.0  # Mean absolute gray-level change per pixel (0-255)
+        self._gray = np.zeros((180, 320), dtype=np.uint8)
+        self._prev_gray = np.zeros((180, 320), dtype=np.uint8)
+        self._last_results = None
+        self._reused_count = 0  # Consecutive frames served from _last_results
+        # Reused output buffers for the downscale and color conversion
+        self._resized = np.empty((180, 320, 3), dtype=np.uint8)
+        self._rgb = np.empty_like(self._resized)
+        # Opt-in OpenCL (T-API) downscale of the full-size capture; off by default since
+        # the upload/download can outweigh the gain, and pointless when MediaPipe
+        # already uses the GPU
+        self.use_opencl = _env_flag("DJARVIS_OPENCL", False)
+        if self.use_opencl and not cv2.ocl.haveOpenCL():
+            self.logger.warning("OpenCL not available, resizing on the CPU")
+            self.use_opencl = False
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
         self.debug_log_interval = 10
         self.debug_log_counter = 0
+        self._last_err_ts = 0.0
         self.logger.info("GestureDetector initialized successfully")
 
-    def _is_open_palm(self, hand_landmarks, wrist_index=0):
+    def close(self):
+        """Release the MediaPipe graph and its worker threads."""
+        self.hands.close()
+
+    def _is_open_palm(self, avg_tip_dist):
         """
         Return True if the average distance between each fingertip
         and the wrist is > some threshold, implying fingers extended.
         """
-        # Indices for fingertips: thumb_tip=4, index_tip=8, middle_tip=12, ring_tip=16, pinky_tip=20
-        fingertip_indices = [4, 8, 12, 16, 20]
-        wrist = hand_landmarks.landmark[wrist_index]
-        distances = []
-        for tip_idx in fingertip_indices:
-            tip = hand_landmarks.landmark[tip_idx]
-            dx = tip.x - wrist.x
-            dy = tip.y - wrist.y
-            dist = (dx**2 + dy**2) ** 0.5
-            distances.append(dist)
-        avg_dist = sum(distances) / len(distances)
-        # Adjust 0.12 to taste; bigger means requiring a wider hand spread
-        return avg_dist > 0.12
-
-    def _is_closed_fist(self, hand_landmarks, wrist_index=0):
+        return avg_tip_dist > OPEN_PALM_THRESH
+
+    def _is_closed_fist(self, avg_tip_dist):
         """
         Return True if all fingertips are close to the wrist, implying a closed fist.
         """
-        fingertip_indices = [4, 8, 12, 16, 20]
-        wrist = hand_landmarks.landmark[wrist_index]
-        distances = []
-        for tip_idx in fingertip_indices:
-            tip = hand_landmarks.landmark[tip_idx]
-            dx = tip.x - wrist.x
-            dy = tip.y - wrist.y
-            dist = (dx**2 + dy**2) ** 0.5
-            distances.append(dist)
-        avg_dist = sum(distances) / len(distances)
-        # Adjust 0.06 to taste; smaller means requiring a tighter fist
-        return avg_dist < 0.06
-
-    def detect_gesture(self, hand_landmarks):
+        return avg_tip_dist < CLOSED_FIST_THRESH
+
+    def _load_landmarks(self, results):
+        """
+        Copy each detected hand's landmarks into the per-hand buffers.
+        This is the only place the landmarks are read per coordinate.
+        """
+        # TaskHandLandmarker results carry the Tasks lists; reading those skips
+        # building protobufs that only landmark drawing needs
+        hands = getattr(results, "hand_landmarks", None)
+        if hands is None:
+            if not results.multi_hand_landmarks:
+                return 0
+            hands = [hand_landmarks.landmark for hand_landmarks in results.multi_hand_landmarks]
+        num_hands = 0
+        for hand, hand_flat in zip(hands, self._hands_flat):
+            for i, point in enumerate(hand):
+                hand_flat[2 * i] = point.x
+                hand_flat[2 * i + 1] = point.y
+            num_hands += 1
+        return num_hands
+
+    def detect_gesture(self, landmarks_xy):
         """
         Identify gestures based on landmark positions.
+        landmarks_xy is a flat float32 array of the 21 (x, y) landmark pairs of one hand.
         """
-        try:
-            current_time = time.time()
-            gesture = None
-            
-            # Extract palm center and thumb tip for better tracking
-            palm_center = hand_landmarks.landmark[0]  # Wrist point
-            thumb_tip = hand_landmarks.landmark[4]    # Thumb tip for additional reference
-            
-            # Use average of palm center and thumb tip for more stable tracking
-            current_position = np.array([(palm_center.x + thumb_tip.x)/2, 
-                                       (palm_center.y + thumb_tip.y)/2])
-            
-            # Initialize position tracking if needed
-            if self.initial_position is None:
-                self.initial_position = current_position
-                self.movement_history = []
-                return None
-            
-            # Calculate movement
-            movement = current_position - self.initial_position
-            self.movement_history.append(movement)
-            
-            # Keep only recent movements
-            if len(self.movement_history) > self.movement_history_size:
-                self.movement_history.pop(0)
-            
-            # Add debug logging for movement tracking
-            self.debug_log_counter += 1
-            
-            # -------------------------------------------------------
-            # Refined SWIPE logic using net displacement in the buffer
-            # -------------------------------------------------------
-            if len(self.movement_history) >= self.min_swipe_frames:
-                first_offset = self.movement_history[0]
-                last_offset = self.movement_history[-1]
-                net_x = last_offset[0] - first_offset[0]
-                net_y = last_offset[1] - first_offset[1]
-                net_dist = abs(net_x)
-                ratio = 0.0
-                if abs(net_x) > 1e-3:
-                    ratio = abs(net_y / net_x)
-
-                if self.debug_log_counter % self.debug_log_interval == 0:
-                    self.logger.debug(f"[SWIPE DEBUG] net_x={net_x:.3f}, net_y={net_y:.3f}, ratio={ratio:.3f}, dist={net_dist:.3f}")
-                    self.logger.debug(f"Time since last gesture: {current_time - self.last_gesture_time:.2f}s")
-
-                can_swipe = (
-                    len(self.movement_history) >= self.min_swipe_frames
-                    and net_dist > 0.08
-                    and ratio < 0.5
-                    and (current_time - self.last_gesture_time >= self.gesture_cooldown)
-                )
-
-                if can_swipe:
+        current_time = time.time()
+        gesture = None
+        
+        # Use average of palm center (wrist, 0) and thumb tip (4) for more stable tracking
+        # .item() yields plain floats, avoiding NumPy scalar arithmetic
+        cx = 0.5 * (landmarks_xy.item(0) + landmarks_xy.item(8))
+        cy = 0.5 * (landmarks_xy.item(1) + landmarks_xy.item(9))
+        
+        # Initialize position tracking if needed
+        if self.initial_position is None:
+            self.initial_position = (cx, cy)
+            self._hist_count = 0
+            return None
+        
+        # Calculate movement and keep only recent movements in the ring buffer
+        mx = cx - self.initial_position[0]
+        my = cy - self.initial_position[1]
+        self._hist_xy[self._hist_head, 0] = mx
+        self._hist_xy[self._hist_head, 1] = my
+        self._hist_head = (self._hist_head + 1) % MOVEMENT_HISTORY_SIZE
+        self._hist_count = min(self._hist_count + 1, MOVEMENT_HISTORY_SIZE)
+
+        avg_tip_dist, net_x, net_y = analyze(
+            landmarks_xy, self._hist_xy, self._hist_head, self._hist_count
+        )
+        
+        # Add debug logging for movement tracking
+        self.debug_log_counter += 1
+        
+        # -------------------------------------------------------
+        # SWIPE and VOLUME logic using net displacement in the buffer
+        # -------------------------------------------------------
+        if self._hist_count >= MIN_SWIPE_FRAMES:
+            abs_x = abs(net_x)
+            abs_y = abs(net_y)
+
+            if self.debug_log_counter % self.debug_log_interval == 0:
+                self.logger.debug(f"[SWIPE DEBUG] net_x={net_x:.3f}, net_y={net_y:.3f}, abs_x={abs_x:.3f}, abs_y={abs_y:.3f}")
+                self.logger.debug(f"Time since last gesture: {current_time - self.last_gesture_time:.2f}s")
+
+            # Both directions need swipe_distance of net travel on their dominant
+            # axis and must respect the gesture cooldown
+            if (current_time - self.last_gesture_time >= GESTURE_COOLDOWN
+                    and max(abs_x, abs_y) > self.swipe_distance):
+                if abs_y < SWIPE_RATIO * abs_x:
+                    # Primarily horizontal => swipe
                     if net_x > 0:
                         gesture = "swipe_right"
                         self.logger.info("Detected SWIPE RIGHT gesture (net displacement)")
                     else:
                         gesture = "swipe_left"
                         self.logger.info("Detected SWIPE LEFT gesture (net displacement)")
+                elif abs_y > VOLUME_RATIO * abs_x:
+                    # Primarily vertical => volume (image y grows downwards)
+                    if net_y < 0:
+                        gesture = "volume_up"
+                        self.logger.info("Detected VOLUME UP gesture (vertical displacement)")
+                    else:
+                        gesture = "volume_down"
+                        self.logger.info("Detected VOLUME DOWN gesture (vertical displacement)")
 
-                    self.last_gesture_time = current_time
-                    self.initial_position = None
-                    self.movement_history = []
-                    return gesture
-
-            # --------------------------------------------------------
-            # Volume Up / Down logic (vertical net displacement)
-            # --------------------------------------------------------
-            if not gesture and len(self.movement_history) >= self.min_swipe_frames:
-                first_offset = self.movement_history[0]
-                last_offset = self.movement_history[-1]
-                net_x = last_offset[0] - first_offset[0]
-                net_y = last_offset[1] - first_offset[1]
-
-                # We'll say if net_y < -0.08, that's volume_up;
-                # if net_y > +0.08, that's volume_down.
-                vertical_dist = abs(net_y)
-                # Also ensure we haven't used a gesture recently
-                if (current_time - self.last_gesture_time >= self.gesture_cooldown):
-                    # Check if the movement is primarily vertical
-                    # i.e. the vertical motion is significantly bigger than horizontal
-                    if abs(net_y) > abs(net_x) * 1.5 and vertical_dist > 0.08:
-                        if net_y < 0:
-                            gesture = "volume_up"
-                            self.logger.info("Detected VOLUME UP gesture (vertical displacement)")
-                        else:
-                            gesture = "volume_down"
-                            self.logger.info("Detected VOLUME DOWN gesture (vertical displacement)")
-
-                        self.last_gesture_time = current_time
-                        self.initial_position = None
-                        self.movement_history = []
-                        return gesture
-
-            # Only check for play/pause if no swipe was detected
-            if not gesture:
-                if current_time - self.last_gesture_time >= self.play_pause_cooldown:
-                    if self._is_open_palm(hand_landmarks):
-                        gesture = "play"
-                        self.logger.info("Detected PLAY gesture - (Open palm / fingers extended)")
-                    elif self._is_closed_fist(hand_landmarks):
-                        gesture = "pause"
-                        self.logger.info("Detected PAUSE gesture - (Closed fist)")
-            
-            # Update tracking
             if gesture:
-                self.initial_position = None
-                self.movement_history = []
                 self.last_gesture_time = current_time
-            else:
-                self.initial_position = current_position
+                self.initial_position = None
+                self._hist_count = 0
+                return gesture
 
-            return gesture
+        # Only check for play/pause if no swipe was detected
+        if not gesture:
+            if current_time - self.last_gesture_time >= PLAY_PAUSE_COOLDOWN:
+                if self._is_open_palm(avg_tip_dist):
+                    gesture = "play"
+                    self.logger.info("Detected PLAY gesture - (Open palm / fingers extended)")
+                elif self._is_closed_fist(avg_tip_dist):
+                    gesture = "pause"
+                    self.logger.info("Detected PAUSE gesture - (Closed fist)")
+        
+        # Update tracking
+        if gesture:
+            self.initial_position = None
+            self._hist_count = 0
+            self.last_gesture_time = current_time
+        else:
+            self.initial_position = (cx, cy)
 
-        except Exception as e:
-            self.logger.exception("Error in detect_gesture:")
-            return None
+        return gesture
+
+    def should_process_frame(self):
+        """
+        Advance the frame counter and return True if this frame should be processed.
+        """
+        self.frame_skip_count += 1
+        return self.frame_skip_count % self.process_every_n_frames == 0
+
+    def _adapt_frame_skip(self, start):
+        """
+        Fold the time since start into the average processing cost and, once per
+        adapt_interval, choose how many frames to skip to stay within target_frame_ms.
+        """
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if self._avg_process_ms is None:
+            self._avg_process_ms = elapsed_ms
+        else:
+            self._avg_process_ms = 0.9 * self._avg_process_ms + 0.1 * elapsed_ms
+
+        now = time.time()
+        if now - self._last_adapt_time < self.adapt_interval:
+            return
+        self._last_adapt_time = now
+
+        every_n = math.ceil(self._avg_process_ms / self.target_frame_ms)
+        every_n = max(1, min(MAX_EVERY_N_FRAMES, every_n))
+        if every_n != self.process_every_n_frames:
+            self.logger.debug(f"Processing every {every_n} frames (avg {self._avg_process_ms:.1f} ms)")
+            self.process_every_n_frames = every_n
+            # Hand displacement between processed frames grows with the skip count,
+            # so scale the travel needed for a gesture to keep detection cadence-invariant,
+            # but not below what landmark jitter alone can produce at a fast cadence
+            self.swipe_distance = max(MIN_SWIPE_NET_DIST,
+                                      SWIPE_NET_DIST * every_n / DEFAULT_EVERY_N_FRAMES)
 
-    def process_frame(self, frame):
+    def process_frame(self, frame, skip_frames=True):
         """
-        Process a single frame and return detected gestures
+        Process a single frame and return detected gestures.
+
+        Pass skip_frames=False when the caller already drops frames with
+        should_process_frame (e.g. by grabbing without retrieving them).
+        A processed frame is returned as the 320x180 internal buffer, which is
+        overwritten on the next call; copy it if it has to outlive that.
+        A skipped frame is returned as passed in, at its own size, since
+        skipping happens before any resize.
         """
-        try:
-            # (Optional) Downscale frame before Mediapipe to reduce CPU load
-            # e.g. down to 320x180
-            frame = cv2.resize(frame, (320, 180), interpolation=cv2.INTER_AREA)
-            
-            # Skip frames to reduce CPU usage
-            self.frame_skip_count += 1
-            if self.frame_skip_count % self.process_every_n_frames != 0:
-                # Return frame without processing any gestures
+        # Skip frames to reduce CPU usage, before spending any work on them
+        if skip_frames and not self.should_process_frame():
+            # Return frame without processing any gestures
+            return frame, None
+        start = time.perf_counter()
+
+        # (Optional) Downscale frame before Mediapipe to reduce CPU load
+        # e.g. down to 320x180
+        if self.use_opencl:
+            # Only the 320x180 result comes back to the CPU
+            frame = cv2.resize(cv2.UMat(frame), (320, 180), interpolation=cv2.INTER_AREA).get()
+        else:
+            frame = cv2.resize(frame, (320, 180), dst=self._resized, interpolation=cv2.INTER_AREA)
+        
+        # Skip inference on near-static frames; the L1 norm of the gray-level
+        # difference is a single SIMD pass inside OpenCV. The reference is the frame
+        # of the last real inference, so slow drift accumulates instead of hiding
+        # below the threshold one step at a time
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        motion_score = cv2.norm(gray, self._prev_gray, cv2.NORM_L1)
+
+        if (self._last_results is not None
+                and self._reused_count < MAX_REUSED_RESULTS
+                and motion_score < self.motion_threshold * gray.size):
+            results = self._last_results
+            self._reused_count += 1
+        else:
+            # MediaPipe only takes contiguous RGB (no BGR format, no [..., ::-1] views),
+            # so swap channels once into the reused buffer; MediaPipe copies its input,
+            # so handing it the shared buffer is safe
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+            try:
+                results = self.hands.process(frame_rgb)
+            except Exception as e:
+                # Rate-limit the log so a persistent failure can't flood it every frame
+                now = time.time()
+                if now - self._last_err_ts > ERROR_LOG_INTERVAL:
+                    self.logger.error(f"Error in hands.process: {str(e)}")
+                    self._last_err_ts = now
                 return frame, None
-            
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(frame_rgb)
-            
-            # Check for BOTH HANDS RAISED => "quit"
-            if results.multi_hand_landmarks and len(results.multi_hand_landmarks) >= 2:
-                # For simplicity, check the first two hands' wrists
-                wrist1 = results.multi_hand_landmarks[0].landmark[0]
-                wrist2 = results.multi_hand_landmarks[1].landmark[0]
-                # If both wrists are above y=0.3, consider that "quit"
-                if wrist1.y < 0.3 and wrist2.y < 0.3:
-                    gesture = "quit"
-                    self.logger.info("Detected TWO HANDS RAISED - Quitting")
-                    return frame, gesture
-            
-            gesture = None
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
+            self._last_results = results
+            self._reused_count = 0
+            # Swap buffers so this frame becomes the reference without a copy
+            self._gray, self._prev_gray = self._prev_gray, gray
+            # Cached results reuse the buffers, so conversion happens once per inference
+            self._num_hands = self._load_landmarks(results)
+        
+        # Check for BOTH HANDS RAISED => "quit"
+        hands_xy = self._hands_xy
+        if self._num_hands >= 2:
+            # For simplicity, check the first two hands' wrists (landmark 0)
+            # If both wrists are above QUIT_WRIST_Y, consider that "quit"
+            if hands_xy[0, 0, 1] < QUIT_WRIST_Y and hands_xy[1, 0, 1] < QUIT_WRIST_Y:
+                gesture = "quit"
+                self.logger.info("Detected TWO HANDS RAISED - Quitting")
+                self._adapt_frame_skip(start)
+                return frame, gesture
+        
+        gesture = None
+        if self._num_hands:
+            for i in range(self._num_hands):
+                if self.debug_draw:
                     self.mp_drawing.draw_landmarks(
                         frame, 
-                        hand_landmarks, 
+                        results.multi_hand_landmarks[i], 
                         self.mp_hands.HAND_CONNECTIONS
                     )
-                    gesture = self.detect_gesture(hand_landmarks)
-                    if gesture:  # Only process the first valid gesture
-                        break
-            else:
-                # Reset position tracking when no hand is detected
-                self.initial_position = None
-                self.movement_history = []
-            
-            return frame, gesture
-        except Exception as e:
-            self.logger.exception("Error in process_frame:")
-            return frame, None 
\ No newline at end of file
+                gesture = self.detect_gesture(self._hands_flat[i])
+                if gesture:  # Only process the first valid gesture
+                    break
+        else:
+            # Reset position tracking when no hand is detected
+            self.initial_position = None
+            self._hist_count = 0
+        
+        self._adapt_frame_skip(start)
+        return frame, gesture
\ No newline at end of file
@@ -0,0 +1,43 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba wheels can lag behind new Python releases
+    njit = None
+
+# Number of hand landmarks MediaPipe reports per hand
+NUM_LANDMARKS = 21
+
+
+def _analyze(landmarks_xy, history, head, count):
+    """
+    Compute the per-frame gesture numbers in one pass (compiled when numba is available).
+
+    landmarks_xy is a flat array of 21 (x, y) landmark pairs, history is the
+    (N, 2) movement ring buffer with its write cursor and fill count.
+    Returns (avg fingertip-to-wrist distance, net_x, net_y) where the net
+    displacement runs from the oldest to the newest sample in the buffer.
+    """
+    wrist_x = landmarks_xy[0]
+    wrist_y = landmarks_xy[1]
+    total = 0.0
+    # Indices for fingertips: thumb_tip=4, index_tip=8, middle_tip=12, ring_tip=16, pinky_tip=20
+    for tip_idx in (4, 8, 12, 16, 20):
+        dx = landmarks_xy[2 * tip_idx] - wrist_x
+        dy = landmarks_xy[2 * tip_idx + 1] - wrist_y
+        total += np.sqrt(dx * dx + dy * dy)
+    avg_dist = total / 5.0
+
+    size = history.shape[0]
+    first = (head - count) % size
+    last = (head - 1) % size
+    net_x = history[last, 0] - history[first, 0]
+    net_y = history[last, 1] - history[first, 1]
+    return np.float32(avg_dist), np.float32(net_x), np.float32(net_y)
+
+
+if njit is not None:
+    analyze = njit('UniTuple(f4, 3)(f4[::1], f4[:, ::1], i8, i8)', cache=True, fastmath=True)(_analyze)
+else:
+    # Plain Python is faster than NumPy fancy indexing for five points
+    analyze = _analyze
@@ -0,0 +1,88 @@
+import logging
+import os
+import time
+
+import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
+from mediapipe.tasks.python import BaseOptions
+from mediapipe.tasks.python import vision
+
+class HandResults:
+    """
+    HandLandmarker results shaped like the mp.solutions.hands results.
+    hand_landmarks holds the Tasks landmark lists the detector reads directly;
+    the protobuf multi_hand_landmarks are only built if something (landmark
+    drawing) asks for them.
+    """
+    __slots__ = ("hand_landmarks", "_multi_hand_landmarks")
+
+    def __init__(self, hand_landmarks):
+        self.hand_landmarks = hand_landmarks
+        self._multi_hand_landmarks = None
+
+    @property
+    def multi_hand_landmarks(self):
+        if not self.hand_landmarks:
+            return None
+        if self._multi_hand_landmarks is None:
+            # Convert to the protobuf lists that draw_landmarks expects
+            self._multi_hand_landmarks = [
+                landmark_pb2.NormalizedLandmarkList(landmark=[
+                    landmark_pb2.NormalizedLandmark(x=point.x, y=point.y, z=point.z)
+                    for point in hand
+                ])
+                for hand in self.hand_landmarks
+            ]
+        return self._multi_hand_landmarks
+
+
+class TaskHandLandmarker:
+    """
+    Drop-in replacement for mp.solutions.hands.Hands backed by the MediaPipe
+    Tasks HandLandmarker, which can run the landmark model on the GPU delegate.
+    Needs a hand_landmarker.task model bundle from the MediaPipe model zoo.
+    """
+    def __init__(self, model_path, use_gpu=True, max_num_hands=2,
+                 min_detection_confidence=0.7, min_tracking_confidence=0.5):
+        self.logger = logging.getLogger(__name__)
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(f"Hand landmarker model not found: {model_path}")
+        delegate = BaseOptions.Delegate.GPU if use_gpu else BaseOptions.Delegate.CPU
+        try:
+            self.landmarker = self._create(model_path, delegate, max_num_hands,
+                                           min_detection_confidence, min_tracking_confidence)
+        except Exception as e:
+            if delegate == BaseOptions.Delegate.CPU:
+                raise
+            # The GPU delegate isn't available on every platform/driver
+            self.logger.warning(f"GPU delegate unavailable, using CPU: {str(e)}")
+            self.landmarker = self._create(model_path, BaseOptions.Delegate.CPU, max_num_hands,
+                                           min_detection_confidence, min_tracking_confidence)
+        self._last_timestamp_ms = -1
+
+    def _create(self, model_path, delegate, max_num_hands,
+                min_detection_confidence, min_tracking_confidence):
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path, delegate=delegate),
+            # VIDEO mode keeps tracking across frames like static_image_mode=False
+            running_mode=vision.RunningMode.VIDEO,
+            num_hands=max_num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+        return vision.HandLandmarker.create_from_options(options)
+
+    def process(self, frame_rgb):
+        """
+        Run the landmarker on an RGB frame and return results shaped like Hands.process.
+        """
+        # VIDEO mode requires strictly increasing timestamps
+        timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+        result = self.landmarker.detect_for_video(image, timestamp_ms)
+        return HandResults(result.hand_landmarks)
+
+    def close(self):
+        self.landmarker.close()
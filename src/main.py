@@ -0,0 +1,232 @@
+import cv2
+import logging
+import numpy as np
+import queue
+import signal
+import threading
+import time
+
+from gesture_detection import GestureDetector
+from spotify_controller import SpotifyController
+
+logger = logging.getLogger(__name__)
+
+# Small bounded queues give back-pressure between stages and keep latency low;
+# a single frame slot means a queued frame is never more than one detection old
+FRAME_QUEUE_SIZE = 1
+GESTURE_QUEUE_SIZE = 2
+QUEUE_TIMEOUT = 0.1  # seconds; lets stage threads notice the stop flag
+ERROR_LOG_INTERVAL = 1.0  # seconds between repeated error logs from a stage
+# Display buffers: one waiting in the mailbox, one on screen, one being written
+DISPLAY_BUFFER_COUNT = 3
+
+
+class DisplayMailbox:
+    """
+    Single-slot hand-off of the latest annotated frame to the GUI thread.
+    A new frame overwrites one that was never shown: preview liveness beats completeness.
+    Frames are copied into a small pool of reused buffers; the one waiting in the
+    slot and the one the GUI last took are never written, so the preview can't tear.
+    Only one thread may put.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._buffers = [None] * DISPLAY_BUFFER_COUNT
+        self._frame = None  # Waiting to be taken
+        self._shown = None  # Taken by the GUI, held until its next take
+
+    def put(self, frame):
+        """Copy frame into a free buffer and make it the newest frame."""
+        with self._lock:
+            index = next(i for i, buffer in enumerate(self._buffers)
+                         if buffer is None or (buffer is not self._frame and buffer is not self._shown))
+        # The chosen buffer is referenced by neither slot, so it is copied unlocked
+        buffer = self._buffers[index]
+        if buffer is None or buffer.shape != frame.shape:
+            buffer = self._buffers[index] = frame.copy()
+        else:
+            np.copyto(buffer, frame)
+        with self._lock:
+            self._frame = buffer
+            self._ready.set()
+
+    def take(self, timeout):
+        """
+        Return the newest frame, or None if none arrived within timeout.
+        The frame stays valid until the next call.
+        """
+        if not self._ready.wait(timeout):
+            return None
+        with self._lock:
+            frame = self._frame
+            self._frame = None
+            self._shown = frame
+            self._ready.clear()
+        return frame
+
+
+def _put_latest(q, item):
+    """Put item on a bounded queue, dropping the oldest entry when full."""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def _reader(cap, gesture_detector, frame_q, stop_event):
+    """
+    Capture stage: keep grabbing so the driver never backs up, and decode a frame
+    into a small pool of reused buffers only when the detector has room for it.
+    The capture object is only ever touched from this thread.
+    """
+    # One buffer per queue slot, plus the one the worker holds and the one being filled.
+    # That is only enough because nothing is decoded while frame_q is full: the reader
+    # never laps the pool into a buffer the detector is still reading
+    buffers = [None] * (FRAME_QUEUE_SIZE + 2)
+    index = 0
+    while not stop_event.is_set():
+        if not cap.grab():
+            logger.error("Failed to read frame from webcam")
+            stop_event.set()
+            break
+        # The detector is still busy with the queued frame: don't decode one it would drop.
+        # Checked first so a busy detector doesn't advance the skip cadence
+        if frame_q.full():
+            continue
+        # Frames the detector would skip are only grabbed, never decoded
+        if not gesture_detector.should_process_frame():
+            continue
+        ret, frame = cap.retrieve(buffers[index])
+        if not ret:
+            logger.error("Failed to decode frame from webcam")
+            continue
+        buffers[index] = frame
+        index = (index + 1) % len(buffers)
+        # Never full here, as this is the only producer; dropping a queued frame
+        # would also break the buffer accounting above
+        frame_q.put_nowait(frame)
+
+
+def _detector(gesture_detector, frame_q, gesture_q, mailbox, stop_event):
+    """
+    Detection stage: run gesture detection and hand results to the other stages.
+    mailbox is None when running headless.
+    """
+    last_err_ts = 0.0
+    while not stop_event.is_set():
+        try:
+            frame = frame_q.get(timeout=QUEUE_TIMEOUT)
+        except queue.Empty:
+            continue
+
+        # Keep the stage alive on a bad frame; a dead detector would freeze the
+        # preview while the main loop waits forever
+        try:
+            # The reader already skipped frames at capture time
+            frame, gesture = gesture_detector.process_frame(frame, skip_frames=False)
+            # process_frame reuses its output buffer; the mailbox copies it out
+            if mailbox is not None:
+                mailbox.put(frame)
+        except Exception:
+            now = time.time()
+            if now - last_err_ts > ERROR_LOG_INTERVAL:
+                logger.exception("Error processing frame:")
+                last_err_ts = now
+            continue
+
+        if gesture == "quit":
+            logger.info("Quit gesture detected, shutting down")
+            stop_event.set()
+            break
+        if gesture:
+            _put_latest(gesture_q, (frame, gesture))
+
+
+def _controller(music_controller, gesture_q, stop_event):
+    """Control stage: forward gestures to the music controller off the capture path."""
+    while not stop_event.is_set():
+        try:
+            _, gesture = gesture_q.get(timeout=QUEUE_TIMEOUT)
+        except queue.Empty:
+            continue
+        music_controller.handle_gesture(gesture)
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    gesture_detector = GestureDetector()
+    music_controller = SpotifyController(
+        client_id="YOUR_CLIENT_ID",      # Replace with your Client ID
+        client_secret="YOUR_CLIENT_SECRET"  # Replace with your Client Secret
+    )
+
+    cap = cv2.VideoCapture(0)
+    if not cap.isOpened():
+        logger.error("Could not open webcam")
+        # Both already own resources: the Spotify worker thread and the landmarker
+        music_controller.close()
+        gesture_detector.close()
+        return
+    # Keep only the newest frame in the driver so latency doesn't build up
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    frame_q = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+    gesture_q = queue.Queue(maxsize=GESTURE_QUEUE_SIZE)
+    # DJARVIS_SHOW=0 runs headless: no landmark drawing and no preview window
+    show = gesture_detector.debug_draw
+    mailbox = DisplayMailbox() if show else None
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+
+    threads = [
+        threading.Thread(target=_reader, args=(cap, gesture_detector, frame_q, stop_event),
+                         name="reader", daemon=True),
+        threading.Thread(target=_detector,
+                         args=(gesture_detector, frame_q, gesture_q, mailbox, stop_event),
+                         name="detector", daemon=True),
+        threading.Thread(target=_controller, args=(music_controller, gesture_q, stop_event),
+                         name="controller", daemon=True),
+    ]
+
+    try:
+        for thread in threads:
+            thread.start()
+
+        if show:
+            # The GUI has to stay on the main thread
+            while not stop_event.is_set():
+                frame = mailbox.take(QUEUE_TIMEOUT)
+                if frame is None:
+                    continue
+                cv2.imshow('AI Virtual DJ', frame)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    stop_event.set()
+        else:
+            logger.info("Running headless, press Ctrl+C or raise both hands to quit")
+            while not stop_event.wait(QUEUE_TIMEOUT):
+                pass
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+    finally:
+        stop_event.set()
+        for thread in threads:
+            thread.join(timeout=1.0)
+        music_controller.close()
+        gesture_detector.close()
+        cap.release()
+        if show:
+            cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
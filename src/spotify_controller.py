@@ -1,11 +1,16 @@
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 import logging
+import queue
+import threading
 import time
 
 # Configure logging for spotify_controller
 logger = logging.getLogger(__name__)
 
+# Playback-state gestures: only the most recent pending one matters
+STATE_GESTURES = ("play", "pause")
+
 class SpotifyController:
     def __init__(self, client_id, client_secret):
         self.logger = logging.getLogger(__name__)
@@ -50,6 +55,20 @@ class SpotifyController:
         self.last_gesture = None
         self.gesture_repeat_cooldown = 1.0  # 1 second local cooldown
         self.last_gesture_time = 0.0
+        # Cache the active device so gestures don't pay for a devices() round-trip
+        self._device_cache = None
+        self._device_cache_ts = 0.0
+        self._device_ttl = 30.0  # seconds
+
+        # Gestures are sent to Spotify by a single worker so callers never wait on HTTP
+        self._cmd_q = queue.Queue(maxsize=4)
+        self._worker = threading.Thread(target=self._spotify_worker, name="spotify", daemon=True)
+        self._worker.start()
+
+    def close(self):
+        """Stop the command worker once it has sent the queued gestures."""
+        self._cmd_q.put(None)
+        self._worker.join(timeout=2.0)
 
     def handle_gesture(self, gesture):
         """Handle the detected gesture."""
@@ -60,10 +79,60 @@ class SpotifyController:
                 self.logger.debug(f"Ignoring repeated gesture: {gesture}")
                 return
             
-            self.logger.debug(f"Processing gesture: {gesture}")
+            self.logger.debug(f"Queueing gesture: {gesture}")
+            try:
+                self._cmd_q.put_nowait(gesture)
+            except queue.Full:
+                if not self._replace_pending_state(gesture):
+                    self.logger.warning(f"Spotify command queue full, dropping gesture: {gesture}")
+                    return
+            # Only a gesture that was actually queued starts the repeat debounce
             self.last_gesture = gesture
             self.last_gesture_time = current_time
+        except Exception as e:
+            self.logger.error(f"Error handling gesture: {str(e)}")
 
+    def _replace_pending_state(self, gesture):
+        """
+        Overwrite the newest queued play/pause with gesture, so on a full queue the
+        latest playback state wins. Returns False if there was nothing to replace.
+        """
+        if gesture not in STATE_GESTURES:
+            return False
+        with self._cmd_q.mutex:
+            pending = self._cmd_q.queue
+            for i in range(len(pending) - 1, -1, -1):
+                if pending[i] in STATE_GESTURES:
+                    self.logger.debug(f"Replacing queued gesture {pending[i]} with {gesture}")
+                    pending[i] = gesture
+                    return True
+        return False
+
+    def _spotify_worker(self):
+        """
+        Send queued gestures to Spotify one at a time.
+        Only play/pause is coalesced: a play or pause followed by another one in the
+        queue is superseded by it. Repeats of the same gesture never reach the queue,
+        since handle_gesture already debounces them.
+        """
+        while True:
+            gesture = self._cmd_q.get()
+            if gesture is None:
+                break
+            # Fold queued play/pause gestures that supersede this one, holding the queue's own lock
+            with self._cmd_q.mutex:
+                pending = self._cmd_q.queue
+                while (gesture in STATE_GESTURES and pending
+                       and pending[0] in STATE_GESTURES):
+                    self.logger.debug(f"Coalescing queued gesture: {gesture}")
+                    gesture = pending.popleft()
+                self._cmd_q.not_full.notify()
+            self._dispatch_gesture(gesture)
+
+    def _dispatch_gesture(self, gesture):
+        """Make the Spotify calls for a gesture."""
+        try:
+            self.logger.debug(f"Processing gesture: {gesture}")
             if gesture == "play":
                 self.play()
             elif gesture == "pause":
@@ -94,6 +163,45 @@ class SpotifyController:
             
         return True
 
+    def _cache_device(self, device):
+        """Remember the active device for the next playback calls."""
+        self._device_cache = device
+        self._device_cache_ts = time.time()
+
+    def _active_device(self):
+        """Return the active device, only calling devices() once the cached one expires."""
+        if self._device_cache and time.time() - self._device_cache_ts < self._device_ttl:
+            return self._device_cache
+        devices = self.sp.devices()
+        active_device = next((d for d in devices['devices'] if d['is_active']), None)
+        # Don't cache a miss, so the next gesture picks up a newly opened client
+        self._device_cache = None
+        if active_device:
+            self._cache_device(active_device)
+        return active_device
+
+    def _on_active_device(self, call, description):
+        """
+        Run a playback call on the active device.
+        Retries once with a fresh lookup if Spotify reports the cached device is gone.
+        Returns True if the call was sent.
+        """
+        for attempt in range(2):
+            active_device = self._active_device()
+            if not active_device:
+                self.logger.warning("No active device found")
+                return False
+            try:
+                self.logger.info(f"{description} on device: {active_device['name']}")
+                call(device_id=active_device['id'])
+                return True
+            except spotipy.exceptions.SpotifyException as e:
+                # 404 NO_ACTIVE_DEVICE: the cached device went inactive
+                if e.http_status != 404 or attempt > 0:
+                    raise
+                self.logger.debug("Cached device is no longer active, refreshing")
+                self._device_cache = None
+
     def handle_action(self, action):
         try:
             if not self._ensure_active_device():
@@ -187,6 +295,7 @@ class SpotifyController:
                     # If already playing, just ensure we're on the right device
                     self.sp.transfer_playback(device_id=active_device['id'], force_play=True)
                 self.is_playing = True
+                self._cache_device(active_device)
             except spotipy.exceptions.SpotifyException as e:
                 self.logger.error(f"Spotify Error: {str(e)}")
                 if e.http_status == 403:
@@ -211,39 +320,21 @@ class SpotifyController:
     def pause(self):
         """Pause playback on active device."""
         try:
-            devices = self.sp.devices()
-            active_device = next((d for d in devices['devices'] if d['is_active']), None)
-            if active_device:
-                self.logger.info("Pausing playback")
-                self.sp.pause_playback(device_id=active_device['id'])
+            if self._on_active_device(self.sp.pause_playback, "Pausing playback"):
                 self.is_playing = False
-            else:
-                self.logger.warning("No active device found")
         except Exception as e:
             self.logger.error(f"Error in pause(): {str(e)}")
 
     def next_track(self):
         """Skip to next track."""
         try:
-            devices = self.sp.devices()
-            active_device = next((d for d in devices['devices'] if d['is_active']), None)
-            if active_device:
-                self.logger.info(f"Next track on device: {active_device['name']}")
-                self.sp.next_track(device_id=active_device['id'])
-            else:
-                self.logger.warning("No active device found")
+            self._on_active_device(self.sp.next_track, "Next track")
         except Exception as e:
             self.logger.error(f"Error in next_track(): {str(e)}")
 
     def previous_track(self):
         """Go back to previous track."""
         try:
-            devices = self.sp.devices()
-            active_device = next((d for d in devices['devices'] if d['is_active']), None)
-            if active_device:
-                self.logger.info(f"Previous track on device: {active_device['name']}")
-                self.sp.previous_track(device_id=active_device['id'])
-            else:
-                self.logger.warning("No active device found")
+            self._on_active_device(self.sp.previous_track, "Previous track")
         except Exception as e:
             self.logger.error(f"Error in previous_track(): {str(e)}") 
\ No newline at end of file